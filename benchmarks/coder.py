@@ -0,0 +1,63 @@
+"""
+Compares CompactCoder with fastapi-cache's JsonCoder on real lesson payloads.
+
+Usage: python -m benchmarks.coder <baseURL> [units]
+"""
+
+import asyncio
+import sys
+from timeit import timeit
+
+from fastapi_cache.coder import Coder, JsonCoder
+
+from src.coder import CompactCoder
+from src.optivum.models.lesson import Lesson
+from src.optivum.models.unit import Unit
+from src.optivum.utils import get_units_list_url
+from src.response import APIResponse
+
+ROUNDS: int = 50
+
+
+async def get_payloads(base_url: str, units_count: int) -> list[APIResponse]:
+    list_url: str = await get_units_list_url(base_url)
+    units: list[Unit] = await Unit.get(list_url)
+    payloads: list[APIResponse] = []
+    for unit in units[:units_count]:
+        lessons: list[Lesson] = await Lesson.get(list_url, unit.type, unit.id, False)
+        payloads.append(APIResponse(data=lessons))
+    return payloads
+
+
+def measure(
+    coder: type[Coder], payloads: list[APIResponse]
+) -> tuple[int, float, float]:
+    encoded: list = [coder.encode(payload) for payload in payloads]
+    size: int = sum(len(entry) for entry in encoded)
+    encode_time: float = timeit(
+        lambda: [coder.encode(payload) for payload in payloads], number=ROUNDS
+    )
+    decode_time: float = timeit(
+        lambda: [coder.decode(entry) for entry in encoded], number=ROUNDS
+    )
+    return size, encode_time / ROUNDS, decode_time / ROUNDS
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    base_url: str = sys.argv[1]
+    units_count: int = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    payloads: list[APIResponse] = asyncio.run(get_payloads(base_url, units_count))
+    print(f"{len(payloads)} lesson payloads, {ROUNDS} rounds")
+    print(f"{'coder':<14}{'size [B]':>12}{'encode [ms]':>14}{'decode [ms]':>14}")
+    for coder in (JsonCoder, CompactCoder):
+        size, encode_time, decode_time = measure(coder, payloads)
+        print(
+            f"{coder.__name__:<14}{size:>12}"
+            f"{encode_time * 1000:>14.2f}{decode_time * 1000:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
+import logging
+import os
+
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.encoders import jsonable_encoder
@@ -6,11 +9,17 @@ from fastapi.responses import JSONResponse
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 from redis import asyncio as aioredis
+from redis.exceptions import RedisError
 from starlette.middleware.cors import CORSMiddleware
 
+from src import config
+from src.coder import VERSION as CODER_VERSION, CompactCoder
 from src.exception import APIException
 from src.optivum.router import router as optivum_router
+from src.optivum.snapshot import load_snapshots
+from src.optivum.warm_up import warm_up_parsers
 from src.response import APIResponse
+from src.session import close_connector, init_connector
 
 app: FastAPI = FastAPI(
     title="Timetable API",
@@ -39,12 +48,46 @@ app.add_middleware(
 app.include_router(optivum_router)
 
 
+logger = logging.getLogger(__name__)
+
+app.state.ready = False
+
+
 @app.on_event("startup")
 async def startup() -> None:
     redis = aioredis.from_url(
-        "redis://localhost", encoding="utf8", decode_responses=True
+        config.REDIS_URL,
+        socket_connect_timeout=config.REDIS_TIMEOUT,
+        socket_timeout=config.REDIS_TIMEOUT,
+    )
+    try:
+        # Opens the connection before traffic; without Redis the API runs uncached
+        await redis.ping()
+    except RedisError:
+        logger.warning(f"Redis at {config.REDIS_URL} is unreachable, running uncached")
+    FastAPICache.init(
+        RedisBackend(redis),
+        prefix=f"fastapi-cache:v{CODER_VERSION}",
+        coder=CompactCoder,
     )
-    FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
+    init_connector(config.UPSTREAM_LIMIT, config.UPSTREAM_LIMIT_PER_HOST)
+    if config.SNAPSHOTS_DIR:
+        load_snapshots(config.SNAPSHOTS_DIR)
+    warm_up_parsers()
+    app.state.ready = True
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    app.state.ready = False
+    await close_connector()
+
+
+@app.get("/ready", response_model=APIResponse, include_in_schema=False)
+async def ready() -> APIResponse:
+    if not app.state.ready:
+        raise APIException(503, "Not ready")
+    return APIResponse(message="Ready")
 
 
 @app.exception_handler(404)
@@ -92,4 +135,7 @@ def api_exception(request: Request, exc: APIException) -> JSONResponse:
 
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", port=8000, host="0.0.0.0")
+    # fastapi-cache derives ETags from hash(), so every worker needs the same
+    # hash seed for If-None-Match to work across workers
+    os.environ.setdefault("PYTHONHASHSEED", "0")
+    uvicorn.run("main:app", port=8000, host="0.0.0.0", workers=config.WORKERS)
@@ -0,0 +1,13 @@
+import argparse
+import asyncio
+
+from src.optivum.snapshot import SNAPSHOT_SUFFIX, export_snapshot
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export an Optivum timetable to a snapshot file."
+    )
+    parser.add_argument("base_url", metavar="baseURL")
+    parser.add_argument("output", help=f"snapshot path, e.g. school{SNAPSHOT_SUFFIX}")
+    args = parser.parse_args()
+    asyncio.run(export_snapshot(args.base_url, args.output))
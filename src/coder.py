@@ -0,0 +1,80 @@
+from typing import Any
+
+import msgpack
+import zstandard
+from fastapi.encoders import jsonable_encoder
+from fastapi_cache.coder import Coder
+from starlette.responses import JSONResponse, Response
+
+MAGIC: bytes = b"\xc1TT"
+VERSION: int = 1
+FLAG_COMPRESSED: int = 0x01
+FLAG_RESPONSE: int = 0x02
+COMPRESSION_THRESHOLD: int = 512
+
+_compressor = zstandard.ZstdCompressor(level=3)
+_decompressor = zstandard.ZstdDecompressor()
+
+
+def _pack_tree(value: Any, shapes: dict[tuple, int]) -> Any:
+    if isinstance(value, dict):
+        keys: tuple = tuple(value)
+        shape_id: int = shapes.setdefault(keys, len(shapes))
+        return {shape_id: [_pack_tree(item, shapes) for item in value.values()]}
+    if isinstance(value, list):
+        return [_pack_tree(item, shapes) for item in value]
+    return value
+
+
+def _unpack_record(pairs: list[tuple], shapes: list[list[str]]) -> dict:
+    ((shape_id, values),) = pairs
+    return dict(zip(shapes[shape_id], values))
+
+
+class CompactCoder(Coder):
+    """
+    Stores cache entries as msgpack with every object turned into a positional
+    record, whose keys are written once per shape in a table at the front
+    of the payload. Bigger payloads are additionally compressed with zstd.
+
+    Layout: MAGIC | version | flags | body, where body is the msgpack shapes
+    table followed by the msgpack tree, zstd compressed if FLAG_COMPRESSED
+    is set. Ready JSONResponses are stored with FLAG_RESPONSE as their raw
+    body and come back as responses, so they skip response model validation.
+    VERSION is also part of the cache key prefix, so only entries written in
+    this format are ever decoded.
+    """
+
+    @classmethod
+    def encode(cls, value: Any) -> bytes:
+        flags: int = 0
+        if isinstance(value, JSONResponse):
+            body: bytes = value.body
+            flags |= FLAG_RESPONSE
+        else:
+            shapes: dict[tuple, int] = {}
+            tree: Any = _pack_tree(jsonable_encoder(value), shapes)
+            table: bytes = msgpack.packb([list(keys) for keys in shapes])
+            body: bytes = table + msgpack.packb(tree)
+        if len(body) >= COMPRESSION_THRESHOLD:
+            body = _compressor.compress(body)
+            flags |= FLAG_COMPRESSED
+        return MAGIC + bytes((VERSION, flags)) + body
+
+    @classmethod
+    def decode(cls, value: bytes) -> Any:
+        flags: int = value[len(MAGIC) + 1]
+        body: bytes = value[len(MAGIC) + 2 :]
+        if flags & FLAG_COMPRESSED:
+            body = _decompressor.decompress(body)
+        if flags & FLAG_RESPONSE:
+            return Response(body, media_type=JSONResponse.media_type)
+        shapes: list[list[str]] = []
+        unpacker = msgpack.Unpacker(
+            object_pairs_hook=lambda pairs: _unpack_record(pairs, shapes),
+            strict_map_key=False,
+            max_buffer_size=len(body),
+        )
+        unpacker.feed(body)
+        shapes.extend(unpacker.unpack())
+        return unpacker.unpack()
@@ -0,0 +1,29 @@
+import math
+import os
+from typing import Optional
+
+
+def get_cpu_count() -> int:
+    """
+    CPUs this container may actually use: the affinity mask, capped by the
+    cgroup v2 CPU quota, instead of the host's core count.
+    """
+    cpu_count: int = len(os.sched_getaffinity(0))
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as file:
+            quota, period = file.read().split()
+    except (OSError, ValueError):
+        return cpu_count
+    if quota == "max":
+        return cpu_count
+    return max(1, min(cpu_count, math.ceil(int(quota) / int(period))))
+
+
+WORKERS: int = int(os.environ.get("WORKERS", get_cpu_count()))
+REDIS_URL: str = os.environ.get("REDIS_URL", "redis://localhost")
+REDIS_TIMEOUT: float = float(os.environ.get("REDIS_TIMEOUT", 1))
+# Upstream limits apply to each worker's connection pool, so the total
+# number of connections to school servers can reach WORKERS times the limit
+UPSTREAM_LIMIT: int = int(os.environ.get("UPSTREAM_LIMIT", 100))
+UPSTREAM_LIMIT_PER_HOST: int = int(os.environ.get("UPSTREAM_LIMIT_PER_HOST", 0))
+SNAPSHOTS_DIR: Optional[str] = os.environ.get("SNAPSHOTS_DIR")
@@ -11,6 +11,7 @@ from src.optivum.utils import (
     get_timetable_validation_date,
     get_unit_url,
 )
+from src.session import get_session
 
 
 class Context(BaseModel):
@@ -24,7 +25,7 @@ class Context(BaseModel):
 
     @staticmethod
     async def get(list_url: str, sort_units: bool) -> "Context":
-        session: ClientSession = ClientSession()
+        session: ClientSession = get_session()
         try:
             response = await session.get(list_url)
         except:
@@ -1,17 +1,23 @@
-from typing import Optional
+from typing import AsyncIterator, Optional
 from datetime import time
 
-from aiohttp import ClientSession
 from bs4 import BeautifulSoup
 from pydantic import BaseModel, Field
 
 from src.exception import APIException
 from src.optivum.models.unit_type import UnitType
+from src.optivum.stream import (
+    HEAD_END,
+    ROW_OR_TABLE_END,
+    TIMETABLE_START,
+    HTMLStream,
+)
 from src.optivum.utils import (
     verify_timetable_page,
     get_unit_url,
     extract_unit_type_and_id_from_url,
 )
+from src.session import get_session
 
 
 class Day(BaseModel):
@@ -73,62 +79,115 @@ class Lesson(BaseModel):
 
     @staticmethod
     async def get(
-        list_url: str, unit_type: UnitType, unit_id: int, empty_lessons: bool
+        list_url: str,
+        unit_type: UnitType,
+        unit_id: int,
+        empty_lessons: bool,
+        include: Optional[dict] = None,
     ) -> list["Lesson"]:
+        lessons: list[Lesson] = [
+            lesson
+            async for lesson in Lesson.stream(
+                list_url, unit_type, unit_id, empty_lessons, include
+            )
+        ]
+        return sorted(lessons, key=lambda lesson: (lesson.day.id, lesson.time_slot.id))
+
+    @staticmethod
+    async def stream(
+        list_url: str,
+        unit_type: UnitType,
+        unit_id: int,
+        empty_lessons: bool,
+        include: Optional[dict] = None,
+    ) -> AsyncIterator["Lesson"]:
         url: str = get_unit_url(list_url, unit_id, unit_type)
-        session: ClientSession = ClientSession()
-        try:
-            response = await session.get(url)
-        except:
-            raise APIException(504, "Gateway timeout")
-        html: str = await response.text(encoding="utf-8")
-        if not verify_timetable_page(html):
-            raise APIException(400, "Invalid unit")
-        soup = BeautifulSoup(html, "html.parser")
-        await session.close()
-        return Lesson.parse_html_table(
-            str(soup.select_one("table.tabela")), empty_lessons
-        )
+        async with get_session() as session:
+            try:
+                response = await session.get(url)
+            except:
+                raise APIException(504, "Gateway timeout")
+            # The shared pool gets the connection back only once the response
+            # is released, which leaving the page after </table> doesn't do
+            try:
+                stream: HTMLStream = HTMLStream(response)
+                head, _ = await stream.read_until(HEAD_END)
+                if not verify_timetable_page(head):
+                    raise APIException(400, "Invalid unit")
+                await stream.read_until(TIMETABLE_START)
+                day_names: list[str] = []
+                row_tag_index: int = 0
+                while True:
+                    row, end = await stream.read_until(ROW_OR_TABLE_END)
+                    if not end or end[1].lower() == "table":
+                        break
+                    row_tag = BeautifulSoup(row, "html.parser")
+                    th_tags: list = row_tag.select("th")
+                    if th_tags:
+                        day_names = [th_tag.text for th_tag in th_tags[2:]]
+                        continue
+                    for lesson in Lesson.parse_html_row(
+                        row_tag, row_tag_index, day_names, empty_lessons, include
+                    ):
+                        yield lesson
+                    row_tag_index += 1
+            finally:
+                response.release()
 
     @staticmethod
-    def parse_html_table(html: str, empty_lessons: bool) -> list["Lesson"]:
+    def parse_html_table(
+        html: str, empty_lessons: bool, include: Optional[dict] = None
+    ) -> list["Lesson"]:
         lessons: list[Lesson] = []
         soup = BeautifulSoup(html, "html.parser")
         row_tags: list = [
             row_tag for row_tag in soup.select("tr") if not row_tag.select("th")
         ]
-        th_tags: list = soup.select("th")
+        day_names: list[str] = [th_tag.text for th_tag in soup.select("th")[2:]]
         for row_tag_index, row_tag in enumerate(row_tags):
-            time_slot: TimeSlot = TimeSlot.parse_html(str(row_tag), row_tag_index)
-            lesson_tags: list = row_tag.select("td.l")
-            for lesson_tag_index, lesson_tag in enumerate(lesson_tags):
-                day: Day = Day(
-                    id=lesson_tag_index + 1, name=th_tags[lesson_tag_index + 2].text
-                )
-                raw_lesson_groups: list = [
-                    BeautifulSoup(raw_lesson_group, "html.parser")
-                    for raw_lesson_group in "".join(
-                        map(str, lesson_tag.contents)
-                    ).split("<br/>")
-                ]
-                for raw_lesson_group in raw_lesson_groups:
-                    raw_lesson_group = (
-                        raw_lesson_group.find("span", recursive=False, style=True)
-                        or raw_lesson_group
-                    )
-                    lesson_group = Lesson.parse_html(
-                        "".join(map(str, raw_lesson_group.contents)), time_slot, day
-                    )
-                    if (
-                        lesson_group.subject_code
-                        or lesson_group.comment
-                        or empty_lessons
-                    ):
-                        lessons.append(lesson_group)
+            lessons += Lesson.parse_html_row(
+                row_tag, row_tag_index, day_names, empty_lessons, include
+            )
         return sorted(lessons, key=lambda lesson: (lesson.day.id, lesson.time_slot.id))
 
     @staticmethod
-    def parse_html(html: str, time_slot: TimeSlot, day: Day) -> "Lesson":
+    def parse_html_row(
+        row_tag,
+        row_tag_index: int,
+        day_names: list[str],
+        empty_lessons: bool,
+        include: Optional[dict] = None,
+    ) -> list["Lesson"]:
+        lessons: list[Lesson] = []
+        time_slot: TimeSlot = TimeSlot.parse_html(str(row_tag), row_tag_index)
+        lesson_tags: list = row_tag.select("td.l")
+        for lesson_tag_index, lesson_tag in enumerate(lesson_tags):
+            day: Day = Day(id=lesson_tag_index + 1, name=day_names[lesson_tag_index])
+            raw_lesson_groups: list = [
+                BeautifulSoup(raw_lesson_group, "html.parser")
+                for raw_lesson_group in "".join(map(str, lesson_tag.contents)).split(
+                    "<br/>"
+                )
+            ]
+            for raw_lesson_group in raw_lesson_groups:
+                raw_lesson_group = (
+                    raw_lesson_group.find("span", recursive=False, style=True)
+                    or raw_lesson_group
+                )
+                lesson_group = Lesson.parse_html(
+                    "".join(map(str, raw_lesson_group.contents)),
+                    time_slot,
+                    day,
+                    include,
+                )
+                if lesson_group.subject_code or lesson_group.comment or empty_lessons:
+                    lessons.append(lesson_group)
+        return lessons
+
+    @staticmethod
+    def parse_html(
+        html: str, time_slot: TimeSlot, day: Day, include: Optional[dict] = None
+    ) -> "Lesson":
         soup = BeautifulSoup(html, "html.parser")
 
         # Comment
@@ -158,7 +217,7 @@ class Lesson(BaseModel):
         room_tag = soup.select_one(".s")
         room = None
         if room_tag:
-            if room_tag.text != "@":
+            if room_tag.text != "@" and (include is None or "room" in include):
                 room = UnitInfo(
                     id=extract_unit_type_and_id_from_url(room_tag["href"])[1]
                     if room_tag.has_attr("href")
@@ -171,19 +230,24 @@ class Lesson(BaseModel):
         teacher_tags: list = soup.select(".n")
         teachers: list[UnitInfo] = []
         for teacher_tag in teacher_tags:
-            teachers.append(
-                UnitInfo(
-                    id=extract_unit_type_and_id_from_url(teacher_tag["href"])[1]
-                    if teacher_tag.has_attr("href")
-                    else None,
-                    code=teacher_tag.text,
+            if include is None or "teachers" in include:
+                teachers.append(
+                    UnitInfo(
+                        id=extract_unit_type_and_id_from_url(teacher_tag["href"])[1]
+                        if teacher_tag.has_attr("href")
+                        else None,
+                        code=teacher_tag.text,
+                    )
                 )
-            )
             teacher_tag.extract()
 
         # Branches
         branches: list[BranchInfo] = []
-        for raw_branch in "".join(map(str, soup.contents)).split(","):
+        if include is not None and "branches" not in include:
+            raw_branches: list[str] = []
+        else:
+            raw_branches: list[str] = "".join(map(str, soup.contents)).split(",")
+        for raw_branch in raw_branches:
             if raw_branch.strip() or group_code:
                 if "-" in raw_branch:
                     group_code = raw_branch.split("-")[1]
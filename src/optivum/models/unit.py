@@ -13,6 +13,7 @@ from src.optivum.utils import (
     extract_unit_code_and_name,
     extract_unit_type_and_id_from_url,
 )
+from src.session import get_session
 
 
 class UnitsListVariant(Enum):
@@ -47,7 +48,7 @@ class Unit(BaseModel):
 
     @staticmethod
     async def get(list_url: str) -> list["Unit"]:
-        session: ClientSession = ClientSession()
+        session: ClientSession = get_session()
         try:
             response = await session.get(str(list_url))
         except:
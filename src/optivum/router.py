@@ -1,9 +1,9 @@
-from typing import Union
+from typing import AsyncIterator, Optional, Union
 from urllib.parse import urljoin
 
 from aiohttp import ClientSession
 from fastapi import APIRouter, Query
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi_cache.decorator import cache
 from pydantic import HttpUrl
 
@@ -11,9 +11,16 @@ from src.exception import APIException
 from src.optivum.models.context import Context
 from src.optivum.models.unit import Unit, SortedUnitsList
 from src.optivum.models.unit_type import UnitType
+from src.optivum.snapshot import Snapshot, get_snapshot
 from src.response import APIResponse
+from src.session import get_session
 from src.optivum.models.lesson import Lesson
 from src.optivum.utils import get_units_list_url, get_school_logo_path
+from src.projection import (
+    get_fields_include,
+    get_projected_response,
+    keep_cache_headers,
+)
 
 router = APIRouter(prefix="/optivum", tags=["Optivum"])
 
@@ -28,6 +35,9 @@ async def get_context(
     base_url: HttpUrl = Query(alias="baseURL"),
     sort_units: bool = Query(alias="sortUnits", default=False),
 ) -> APIResponse[Context]:
+    snapshot: Optional[Snapshot] = get_snapshot(base_url)
+    if snapshot:
+        return APIResponse(data=snapshot.get_context(sort_units))
     list_url: str = await get_units_list_url(base_url)
     context: Context = await Context.get(list_url, sort_units)
     return APIResponse(data=context)
@@ -38,14 +48,29 @@ async def get_context(
     response_model=APIResponse[Union[list[Unit], SortedUnitsList]],
     response_model_by_alias=True,
 )
+@keep_cache_headers
 @cache(expire=28800)
 async def get_units(
     base_url: HttpUrl = Query(alias="baseURL"),
     sort: bool = Query(alias="sort", default=False),
-) -> APIResponse[Union[list[Unit], SortedUnitsList]]:
-    list_url: str = await get_units_list_url(base_url)
-    units: list[Unit] = await Unit.get(list_url)
-    return APIResponse(data=SortedUnitsList.get(units) if sort else units)
+    fields: Optional[str] = Query(alias="fields", default=None),
+) -> Union[APIResponse[Union[list[Unit], SortedUnitsList]], JSONResponse]:
+    include: Optional[dict] = get_fields_include(Unit, fields) if fields else None
+    snapshot: Optional[Snapshot] = get_snapshot(base_url)
+    if snapshot:
+        units: list[Unit] = snapshot.units
+    else:
+        list_url: str = await get_units_list_url(base_url)
+        units: list[Unit] = await Unit.get(list_url)
+    response = APIResponse(data=SortedUnitsList.get(units) if sort else units)
+    if include is None:
+        return response
+    if sort:
+        return get_projected_response(
+            response,
+            {field: {"__all__": include} for field in SortedUnitsList.__fields__},
+        )
+    return get_projected_response(response, {"__all__": include})
 
 
 @router.get("/getSchoolLogo", response_class=StreamingResponse)
@@ -54,7 +79,7 @@ async def get_school_logo(
     base_url: HttpUrl = Query(alias="baseURL"),
 ) -> StreamingResponse:
     list_url: str = await get_units_list_url(base_url)
-    session: ClientSession = ClientSession()
+    session: ClientSession = get_session()
     try:
         response = await session.get(list_url)
     except:
@@ -75,15 +100,65 @@ async def get_school_logo(
     response_model=APIResponse[list[Lesson]],
     response_model_by_alias=True,
 )
+@keep_cache_headers
 @cache(expire=28800)
 async def get_lessons(
     base_url: HttpUrl = Query(alias="baseURL"),
     empty_lessons: bool = Query(alias="emptyLessons", default=False),
     unit_type: UnitType = Query(alias="unitType"),
     unit_id: int = Query(alias="unitId"),
-) -> APIResponse[list[list[Lesson]]]:
+    fields: Optional[str] = Query(alias="fields", default=None),
+) -> Union[APIResponse[list[Lesson]], JSONResponse]:
+    include: Optional[dict] = get_fields_include(Lesson, fields) if fields else None
+    snapshot: Optional[Snapshot] = get_snapshot(base_url)
+    if snapshot:
+        lessons: list[Lesson] = snapshot.get_lessons(unit_type, unit_id, empty_lessons)
+    else:
+        list_url = await get_units_list_url(base_url)
+        lessons: list[Lesson] = await Lesson.get(
+            list_url, unit_type, unit_id, empty_lessons, include
+        )
+    if include is None:
+        return APIResponse(data=lessons)
+    return get_projected_response(APIResponse(data=lessons), {"__all__": include})
+
+
+@router.get("/streamLessons", response_class=StreamingResponse)
+async def stream_lessons(
+    base_url: HttpUrl = Query(alias="baseURL"),
+    empty_lessons: bool = Query(alias="emptyLessons", default=False),
+    unit_type: UnitType = Query(alias="unitType"),
+    unit_id: int = Query(alias="unitId"),
+    fields: Optional[str] = Query(alias="fields", default=None),
+) -> StreamingResponse:
+    """
+    Streams lessons as NDJSON in timetable row order: by time slot, then day.
+    """
+    include: Optional[dict] = get_fields_include(Lesson, fields) if fields else None
+    snapshot: Optional[Snapshot] = get_snapshot(base_url)
+    if snapshot:
+        snapshot_lessons: list[Lesson] = sorted(
+            snapshot.get_lessons(unit_type, unit_id, empty_lessons),
+            key=lambda lesson: (lesson.time_slot.id, lesson.day.id),
+        )
+        return StreamingResponse(
+            (
+                f"{lesson.json(by_alias=True, include=include)}\n"
+                for lesson in snapshot_lessons
+            ),
+            media_type="application/x-ndjson",
+        )
     list_url = await get_units_list_url(base_url)
-    lessons: list[Lesson] = await Lesson.get(
-        list_url, unit_type, unit_id, empty_lessons
+    lessons: AsyncIterator[Lesson] = Lesson.stream(
+        list_url, unit_type, unit_id, empty_lessons, include
     )
-    return APIResponse(data=lessons)
+    # Errors have to be raised before the response starts
+    first_lesson: Optional[Lesson] = await anext(lessons, None)
+
+    async def iter_lines() -> AsyncIterator[str]:
+        if first_lesson:
+            yield f"{first_lesson.json(by_alias=True, include=include)}\n"
+        async for lesson in lessons:
+            yield f"{lesson.json(by_alias=True, include=include)}\n"
+
+    return StreamingResponse(iter_lines(), media_type="application/x-ndjson")
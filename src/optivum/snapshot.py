@@ -0,0 +1,160 @@
+import logging
+import os
+import sqlite3
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+from src.coder import CompactCoder
+from src.exception import APIException
+from src.optivum.models.context import Context
+from src.optivum.models.lesson import Lesson
+from src.optivum.models.unit import SortedUnitsList, Unit
+from src.optivum.models.unit_type import UnitType
+from src.optivum.utils import get_index_url, get_units_list_url
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION: int = 1
+SNAPSHOT_SUFFIX: str = ".sqlite"
+
+SCHEMA: str = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE units (position INTEGER PRIMARY KEY, record BLOB NOT NULL);
+CREATE TABLE lessons (
+    type INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    record BLOB NOT NULL,
+    PRIMARY KEY (type, id)
+);
+"""
+
+
+class Snapshot:
+    """
+    Read-only view of a school exported by export_snapshot. Units are kept
+    in memory, lessons are read per unit from the indexed lessons table.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.connection = sqlite3.connect(
+            f"file:{path}?mode=ro", uri=True, check_same_thread=False
+        )
+        try:
+            meta: dict[str, str] = dict(self.connection.execute("SELECT * FROM meta"))
+            if int(meta.get("version", 0)) != SNAPSHOT_VERSION:
+                raise ValueError(f"Unsupported snapshot version in {path}")
+            self.index_url: str = meta["index_url"]
+            self.list_url: str = meta["list_url"]
+            self.school_name: Optional[str] = meta.get("school_name")
+            self.generation_date: Optional[str] = meta.get("generation_date")
+            self.validation_date: Optional[str] = meta.get("validation_date")
+            self.units: list[Unit] = [
+                Unit.parse_obj(CompactCoder.decode(record))
+                for (record,) in self.connection.execute(
+                    "SELECT record FROM units ORDER BY position"
+                )
+            ]
+        except Exception:
+            self.connection.close()
+            raise
+
+    def get_context(self, sort_units: bool) -> Context:
+        return Context(
+            school_name=self.school_name,
+            generation_date=self.generation_date,
+            validation_date=self.validation_date,
+            units=SortedUnitsList.get(self.units) if sort_units else self.units,
+        )
+
+    def get_lessons(
+        self, unit_type: UnitType, unit_id: int, empty_lessons: bool
+    ) -> list[Lesson]:
+        row: Optional[tuple] = self.connection.execute(
+            "SELECT record FROM lessons WHERE type = ? AND id = ?",
+            (int(unit_type), unit_id),
+        ).fetchone()
+        if not row:
+            raise APIException(400, "Invalid unit")
+        lessons: list[Lesson] = [
+            Lesson.parse_obj(lesson) for lesson in CompactCoder.decode(row[0])
+        ]
+        return [
+            lesson
+            for lesson in lessons
+            if lesson.subject_code or lesson.comment or empty_lessons
+        ]
+
+
+snapshots: dict[str, Snapshot] = {}
+
+
+def get_snapshot_key(url: str) -> str:
+    """
+    Normalizes a timetable page URL, so that spellings of the same school
+    differing only in scheme, host case, "www." or default port match.
+    """
+    parts = urlsplit(url)
+    host: str = (parts.hostname or "").removeprefix("www.")
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    return f"{host}{parts.path}"
+
+
+def load_snapshots(directory: str) -> None:
+    for path in sorted(Path(directory).glob(f"*{SNAPSHOT_SUFFIX}")):
+        try:
+            snapshot: Snapshot = Snapshot(str(path))
+        except (sqlite3.Error, ValueError, KeyError):
+            logger.warning(f"Skipping unreadable snapshot {path}", exc_info=True)
+            continue
+        snapshots[get_snapshot_key(snapshot.index_url)] = snapshot
+        snapshots[get_snapshot_key(snapshot.list_url)] = snapshot
+
+
+def get_snapshot(base_url: str) -> Optional[Snapshot]:
+    if not snapshots:
+        return None
+    return snapshots.get(get_snapshot_key(get_index_url(base_url)))
+
+
+async def export_snapshot(base_url: str, path: str) -> None:
+    list_url: str = await get_units_list_url(base_url)
+    context: Context = await Context.get(list_url, False)
+    temp_path: str = f"{path}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    connection = sqlite3.connect(temp_path)
+    try:
+        connection.executescript(SCHEMA)
+        connection.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("version", str(SNAPSHOT_VERSION)),
+                ("index_url", get_index_url(base_url)),
+                ("list_url", list_url),
+                ("school_name", context.school_name),
+                ("generation_date", context.generation_date),
+                ("validation_date", context.validation_date),
+            ],
+        )
+        connection.executemany(
+            "INSERT INTO units VALUES (?, ?)",
+            [
+                (position, CompactCoder.encode(unit))
+                for position, unit in enumerate(context.units)
+            ],
+        )
+        for unit in context.units:
+            lessons: list[Lesson] = await Lesson.get(list_url, unit.type, unit.id, True)
+            connection.execute(
+                "INSERT OR REPLACE INTO lessons VALUES (?, ?, ?)",
+                (int(unit.type), unit.id, CompactCoder.encode(lessons)),
+            )
+        connection.commit()
+        connection.close()
+        os.replace(temp_path, path)
+    finally:
+        connection.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,46 @@
+import codecs
+import re
+from typing import Optional
+
+from aiohttp import ClientResponse
+
+HEAD_END = re.compile(r"</head\s*>", re.IGNORECASE)
+TIMETABLE_START = re.compile(r"<table[^>]*\bclass=\"?tabela\b[^>]*>", re.IGNORECASE)
+ROW_OR_TABLE_END = re.compile(r"</(tr|table)\s*>", re.IGNORECASE)
+
+
+class HTMLStream:
+    """
+    Decodes a response body chunk by chunk as it arrives. Text is handed out
+    in pieces ending at a pattern match and dropped from the buffer, so the
+    whole page is never held in memory.
+    """
+
+    def __init__(
+        self, response: ClientResponse, encoding: str = "utf-8", chunk_size: int = 16384
+    ) -> None:
+        self.content = response.content
+        self.decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        self.chunk_size = chunk_size
+        self.buffer = ""
+
+    async def read_chunk(self) -> bool:
+        chunk: bytes = await self.content.read(self.chunk_size)
+        self.buffer += self.decoder.decode(chunk, final=not chunk)
+        return bool(chunk)
+
+    async def read_until(self, pattern: re.Pattern) -> tuple[str, Optional[re.Match]]:
+        position: int = 0
+        while True:
+            match: Optional[re.Match] = pattern.search(self.buffer, position)
+            if match:
+                text: str = self.buffer[: match.end()]
+                self.buffer = self.buffer[match.end() :]
+                return text, match
+            # Patterns start with "<", so a match cut by the chunk boundary
+            # can only begin at the last "<" in the buffer
+            last_tag_start: int = self.buffer.rfind("<", position)
+            position = last_tag_start if last_tag_start != -1 else len(self.buffer)
+            if not await self.read_chunk():
+                text, self.buffer = self.buffer, ""
+                return text, None
@@ -7,6 +7,7 @@ from bs4 import BeautifulSoup
 
 from src.exception import APIException
 from src.optivum.models.unit_type import UnitType
+from src.session import get_session
 
 
 def extract_unit_code_and_name(
@@ -38,8 +39,7 @@ def verify_timetable_page(html: str) -> bool:
     return False
 
 
-async def get_units_list_url(url: str) -> str:
-    session: ClientSession = ClientSession()
+def get_index_url(url: str) -> str:
     if len(url) <= 5:
         raise APIException(400, 'Invalid "baseURL"')
     if url[-5:] != ".html":
@@ -49,6 +49,12 @@ async def get_units_list_url(url: str) -> str:
             url = f"{url}/index.html"
     elif extract_unit_type_and_id_from_url(url) != (None, None):
         url = urljoin(url, "../index.html")
+    return url
+
+
+async def get_units_list_url(url: str) -> str:
+    url = get_index_url(url)
+    session: ClientSession = get_session()
     try:
         response = await session.get(url)
     except:
@@ -0,0 +1,33 @@
+from bs4 import BeautifulSoup
+
+from src.optivum.models.lesson import Lesson
+from src.optivum.models.unit import Unit, UnitsListVariant
+from src.optivum.utils import get_timetable_generation_date, verify_timetable_page
+
+WARM_UP_PAGE: str = """
+<html>
+<head>
+<meta name="description" content="Szkoła. Plan lekcji oddziału 1a utworzony za pomocą programu Plan lekcji Optivum firmy VULCAN">
+</head>
+<body>
+<table class="tabela">
+<tr><th>Nr</th><th>Godz</th><th>Poniedziałek</th></tr>
+<tr><td class="nr">1</td><td class="g">8:00-8:45</td><td class="l"><span class="p">mat-1/2</span> <a href="n1.html" class="n">JK</a> <a href="o1.html" class="o">1a</a> <a href="s1.html" class="s">12</a></td></tr>
+</table>
+<table><tr><td class="op"><table><tr><td>wygenerowano 01.09.2023 za pomocą programu</td></tr></table></td></tr></table>
+<a href="plany/o1.html">1a 1a</a>
+</body>
+</html>
+"""
+
+
+def warm_up_parsers() -> None:
+    """
+    Runs every parser once on a small page, so bs4, pydantic validators and
+    regexes are loaded before the worker takes its first request.
+    """
+    verify_timetable_page(WARM_UP_PAGE)
+    get_timetable_generation_date(WARM_UP_PAGE)
+    Unit.parse_html(WARM_UP_PAGE, UnitsListVariant.get(WARM_UP_PAGE))
+    soup = BeautifulSoup(WARM_UP_PAGE, "html.parser")
+    Lesson.parse_html_table(str(soup.select_one("table.tabela")), True)
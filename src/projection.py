@@ -0,0 +1,75 @@
+from functools import wraps
+from typing import Any, Callable, Optional, Type
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_SINGLETON
+from pydantic.utils import lenient_issubclass
+
+from src.exception import APIException
+from src.response import APIResponse
+
+
+def get_fields_include(model: Type[BaseModel], fields: str) -> dict:
+    include: dict = {}
+    for path in fields.split(","):
+        names: list[str] = path.strip().split(".")
+        current_model: Type[BaseModel] = model
+        current_include: dict = include
+        for index, name in enumerate(names):
+            field = next(
+                (
+                    field
+                    for field in current_model.__fields__.values()
+                    if name in (field.name, field.alias)
+                ),
+                None,
+            )
+            if not field:
+                raise APIException(400, 'Invalid "fields"')
+            if index == len(names) - 1:
+                current_include[field.name] = True
+                break
+            if not lenient_issubclass(field.type_, BaseModel):
+                raise APIException(400, 'Invalid "fields"')
+            is_list: bool = field.shape != SHAPE_SINGLETON
+            field_include = current_include.setdefault(
+                field.name, {"__all__": {}} if is_list else {}
+            )
+            if field_include is True:
+                break
+            current_include = field_include["__all__"] if is_list else field_include
+            current_model = field.type_
+    return include
+
+
+def get_projected_response(response: APIResponse, include: dict) -> JSONResponse:
+    return JSONResponse(
+        content=jsonable_encoder(
+            response.dict(
+                by_alias=True,
+                include={"data": include, "message": True, "detail": True},
+            )
+        )
+    )
+
+
+def keep_cache_headers(func: Callable) -> Callable:
+    """
+    FastAPI sends a returned response as is, without the headers fastapi-cache
+    put on the injected one, so copy them over for projected responses.
+    """
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        result: Any = await func(*args, **kwargs)
+        response: Optional[Response] = next(
+            (value for value in kwargs.values() if isinstance(value, Response)), None
+        )
+        if response and isinstance(result, Response) and result is not response:
+            for key, value in response.headers.items():
+                result.headers.setdefault(key, value)
+        return result
+
+    return wrapper
@@ -0,0 +1,26 @@
+from typing import Optional
+
+from aiohttp import ClientSession, TCPConnector
+
+connector: Optional[TCPConnector] = None
+
+
+def init_connector(limit: int, limit_per_host: int) -> None:
+    global connector
+    connector = TCPConnector(limit=limit, limit_per_host=limit_per_host)
+
+
+async def close_connector() -> None:
+    if connector:
+        await connector.close()
+
+
+def get_session() -> ClientSession:
+    """
+    Returns a session using the worker's shared connection pool, so upstream
+    connections are reused and limited across requests. Falls back to a
+    standalone session outside the app, e.g. in the snapshot export.
+    """
+    if not connector:
+        return ClientSession()
+    return ClientSession(connector=connector, connector_owner=False)